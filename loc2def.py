@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import logging
+import re
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import Sequence
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+_UNPLACED_RE = re.compile(rb"UNPLACED")
+
 
 def save_locations_to_def(
         def_path: Path,
@@ -33,31 +36,34 @@ def save_locations_to_def(
     if out_path.suffix.lower() != ".def":
         out_path = out_path.with_suffix(".def")
 
-    pos_iter: Iterable[Sequence[float]] = iter(positions)
+    # Truncate once (same semantics as ``int(x)``) and pre-format every
+    # replacement token, so the substitution below only has to hand them
+    # out in order.
+    pos = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+    if not np.isfinite(pos).all():
+        raise ValueError("Positions contain NaN or infinite coordinates.")
+    pos = pos.astype(np.int64)
+    repl = [f"PLACED ( {x} {y} ) N".encode("ascii") for x, y in pos.tolist()]
+
+    repl_iter = iter(repl)
 
-    with def_path.open("r") as src, out_path.open("w") as dst:
-        for line in src:
-            if "UNPLACED" in line:
-                try:
-                    x, y = next(pos_iter)
-                except StopIteration as exc:
-                    raise ValueError(
-                        "Fewer positions than UNPLACED components in DEF file."
-                    ) from exc
+    def _next_placement(_match: re.Match) -> bytes:
+        try:
+            return next(repl_iter)
+        except StopIteration as exc:
+            raise ValueError(
+                "Fewer positions than UNPLACED components in DEF file."
+            ) from exc
 
-                line = line.replace(
-                    "UNPLACED", f"PLACED ( {int(x)} {int(y)} ) N", 1
-                )
-            dst.write(line)
+    # re.subn walks the whole file in C; only the callback runs per match.
+    text, n_placed = _UNPLACED_RE.subn(_next_placement, def_path.read_bytes())
+    out_path.write_bytes(text)
 
     # Check if extra positions were supplied
-    try:
-        next(pos_iter)
+    if n_placed < len(repl):
         logger.warning(
             "More positions provided than UNPLACED components—extra values ignored."
         )
-    except StopIteration:
-        pass
 
 
 if __name__ == '__main__':
@@ -32,14 +32,49 @@ from __future__ import annotations
 
 import argparse
 import logging
+import mmap
+import multiprocessing
+import os
 import re
-from dataclasses import dataclass
+import zipfile
+import zlib
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+import numpy as np
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(name)s:%(message)s")
 LOGGER = logging.getLogger(__name__)
 
+# Regexes are compiled once here rather than inside the parsing loops. They
+# operate on bytes: DEF is plain ASCII, so the file is scanned through mmap
+# without decoding it.
+# Section keywords are matched case-sensitively: LEF/DEF writers (OpenROAD
+# included) emit them in upper case, and dropping IGNORECASE keeps the
+# automaton for this whole-file scan small.
+_SECTION_RE = re.compile(rb"\b(?:(END)\s+)?(COMPONENTS|PINS|NETS)\b(?:\s+(\d+)\s*;)?")
+# One component entry: its name and the rest of the entry. The FIXED
+# coordinates are only searched for in bodies that mention FIXED.
+_COMP_RE = re.compile(rb"-\s+(\S+)([^;]*);")
+_FIXED_RE = re.compile(rb"\bFIXED\s*\(\s*(-?\d+)\s+(-?\d+)\s*\)")
+# Pin name plus the coordinates of its (last) PLACED/FIXED/COVER statement.
+_PIN_RE = re.compile(
+    rb"-\s+(\S+).*\b(?:PLACED|FIXED|COVER)\s*\(\s*(-?\d+)\s+(-?\d+)\s*\)",
+    flags=re.DOTALL,
+)
+# One net entry: its name and the body holding the ( inst pin ) pairs.
+_NET_RE = re.compile(rb"-\s+(\S+)\s+([^;]*);")
+_CONNECT_RE = re.compile(rb"\(\s+(.*?)\s+(.*?)\s+\)")
+
+# With ``write_hypergraph(..., parallel=True)``, below this many hyperedges
+# formatting stays in-process. Workers are forked and read the edges in
+# place; only (start, stop) ranges go out and formatted text comes back.
+_PARALLEL_EDGE_THRESHOLD = 500_000
+
+# Bump when the layout of the parse cache (see ``parse_def_file``) changes.
+_CACHE_VERSION = 2
+
 
 @dataclass
 class GraphData:
@@ -48,87 +83,132 @@ class GraphData:
     total_cell_number: int
     total_io_number: int
     fixed_node_num: int
-    fixed_id: List[int]
-    fixed_pos: List[List[int]]
-    movable_id: List[int]
-    io_id: List[int]
-    io_pos: List[List[int]]
+    fixed_id: np.ndarray  # (F,) int64
+    fixed_pos: np.ndarray  # (F, 2) int64
+    movable_id: np.ndarray  # (M,) int64
+    io_id: np.ndarray  # (P,) int64
+    io_pos: np.ndarray  # (P, 2) int64
     net_cell_index: List[List[int]]
+    # Reverse of the name map returned by :func:`parse_def_file`, built once.
+    id_to_name: Optional[Dict[int, str]] = field(default=None, repr=False)
 
 
 # ---------------------------------------------------------------------------
 # Parsing helpers
 # ---------------------------------------------------------------------------
 
-def parse_def_file(def_path: Path) -> tuple[GraphData, Dict[str, int]]:
-    """Parse the DEF file and return graph data plus a name‑to‑index map."""
-
-    info = def_path.read_text(encoding="utf-8", errors="ignore")
-
-    # --- Nets section ---------------------------------------------------- #
-    nets_start = re.search(r"\bnets\s+\d+\s*;", info, flags=re.IGNORECASE)
-    nets_end = re.search(r"\bend\s+nets\s+", info, flags=re.IGNORECASE)
-    if not nets_start or not nets_end:
-        raise ValueError("NETS section not found in DEF file.")
-    net_info = info[nets_start.start(): nets_end.start()]
+def parse_def_file(
+        def_path: Path, use_cache: bool = True
+) -> tuple[GraphData, Dict[str, int]]:
+    """Parse the DEF file and return graph data plus a name‑to‑index map.
+
+    With *use_cache*, the result is stored next to the DEF as
+    ``<stem>.graph.npz`` and reused for as long as the DEF's mtime and size
+    are unchanged.
+    """
+
+    if not use_cache:
+        return _parse_def_file(def_path)
+
+    stat = def_path.stat()
+    key = np.array([_CACHE_VERSION, stat.st_mtime_ns, stat.st_size], dtype=np.int64)
+    cache_path = def_path.with_suffix(".graph.npz")
+
+    cached = _load_graph_cache(cache_path, key)
+    if cached is not None:
+        LOGGER.info("Loaded parsed DEF from cache %s", cache_path)
+        return cached
+
+    graph_data, name_map = _parse_def_file(def_path)
+    _save_graph_cache(cache_path, key, graph_data, name_map)
+    return graph_data, name_map
+
+
+def _parse_def_file(def_path: Path) -> tuple[GraphData, Dict[str, int]]:
+    """Uncached implementation of :func:`parse_def_file`."""
+
+    # Map the file instead of decoding it into a str; only the three
+    # sections we need are copied out of the mapping.
+    with def_path.open("rb") as fh, \
+            mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as info:
+        # --- Section index (single pass) -------------------------------- #
+        # Record the first header / END marker of every section we care
+        # about, along with the declared entry count of each header.
+        sections: Dict[str, int] = {}
+        counts: Dict[str, int] = {}
+        for match in _SECTION_RE.finditer(info):
+            end_kw, keyword, count = match.groups()
+            keyword = keyword.decode("ascii")
+            if end_kw:
+                sections.setdefault(f"END {keyword}", match.start())
+            elif count is not None and keyword not in sections:
+                sections[keyword] = match.start()
+                counts[keyword] = int(count)
+            if len(sections) == 6:
+                break
+
+        # --- Nets section ------------------------------------------------ #
+        if "NETS" not in sections or "END NETS" not in sections:
+            raise ValueError("NETS section not found in DEF file.")
+        net_info = info[sections["NETS"]: sections["END NETS"]]
+
+        comp_section = info[sections["COMPONENTS"]: sections["END COMPONENTS"]]
+        pins_section = info[sections["PINS"]: sections["END PINS"]]
 
     # --- Components section --------------------------------------------- #
-    total_cell_number = int(
-        re.search(r"COMPONENTS\s+(\d+)\s*;", info, flags=re.IGNORECASE).group(1)
-    )
-
-    comp_section = info[info.find("COMPONENTS"): info.find("END COMPONENTS")]
-    comp_entries = [e.strip() for e in comp_section.split(";") if e.strip()][1:]  # skip header line
+    total_cell_number = counts["COMPONENTS"]
 
-    movable_id: List[int] = []
-    fixed_id: List[int] = []
-    fixed_pos: List[List[int]] = []
-    cell_name_to_index: Dict[str, int] = {}
+    comp_matches = _COMP_RE.findall(comp_section)
 
-    movable_counter = 0
-    for orig_idx, entry in enumerate(comp_entries):
-        cell_name = re.split(r"\s+", re.search(r"-\s+(.*)", entry).group(1))[0]
-        cell_name_to_index[cell_name] = orig_idx
-        tokens = entry.split()
+    # Keyed by the raw (bytes) names while parsing; decoded once at the end.
+    raw_name_to_index: Dict[bytes, int] = {
+        name: orig_idx for orig_idx, (name, _) in enumerate(comp_matches)
+    }
 
-        if "FIXED" in tokens:
-            fixed_id.append(orig_idx)
-            pos_idx = tokens.index("FIXED") + 2
-            fixed_pos.append([int(tokens[pos_idx]), int(tokens[pos_idx + 1])])
-        else:
-            movable_id.append(orig_idx)
-            movable_counter += 1
+    fixed_hits = [
+        _FIXED_RE.search(body) if b"FIXED" in body else None
+        for _, body in comp_matches
+    ]
+    fixed_mask = np.fromiter(
+        (hit is not None for hit in fixed_hits), dtype=bool, count=len(fixed_hits)
+    )
+    fixed_id = np.flatnonzero(fixed_mask).astype(np.int64)
+    movable_id = np.flatnonzero(~fixed_mask).astype(np.int64)
+    fixed_pos = (
+        np.array([hit.groups() for hit in fixed_hits if hit], dtype=np.bytes_)
+        .reshape(-1, 2)
+        .astype(np.int64)
+    )
 
     # --- Pins section ---------------------------------------------------- #
-    total_io_number = int(re.search(r"pins\s+(\d+)", info, flags=re.IGNORECASE).group(1))
-    pins_section = info[info.find("PINS"): info.find("END PINS")]
-    pin_entries = [e.strip() for e in pins_section.split(";") if e.strip()][1:]
+    total_io_number = counts["PINS"]
+    pin_entries = [e.strip() for e in pins_section.split(b";") if e.strip()][1:]
 
     io_id: List[int] = []
     io_pos: List[List[int]] = []
 
     for offset, pin_entry in enumerate(pin_entries):
-        pin_name = pin_entry.split()[1]
+        pin_match = _PIN_RE.search(pin_entry)
         idx = offset + total_cell_number
-        cell_name_to_index[pin_name] = idx
+        raw_name_to_index[pin_match.group(1)] = idx
         io_id.append(idx)
-        pos_line = pin_entry.split("\n")[-1]
-        io_pos.append([int(pos_line.split()[3]), int(pos_line.split()[4])])
+        io_pos.append([int(pin_match.group(2)), int(pin_match.group(3))])
 
     # --- Nets connectivity ---------------------------------------------- #
-    subnet_regex = re.compile(r"-\s+(.*?)\s")
-    connect_regex = re.compile(r"\(\s+(.*?)\s+(.*?)\s+\)")
     net_cell_index: List[List[int]] = []
 
-    for net_entry in [e for e in net_info.split(";") if e.strip()]:
-        net_match = subnet_regex.search(net_entry)
-        if not net_match or net_match.group(1) == "clk_i":
-            continue  # skip clock net or malformed line
-        cells: List[int] = []
-        for token_a, token_b in connect_regex.findall(net_entry):
-            target = token_b if token_a == "PIN" else token_a
-            cells.append(cell_name_to_index[target])
-        net_cell_index.append(cells)
+    for net_match in _NET_RE.finditer(net_info):
+        net_name, net_body = net_match.groups()
+        if net_name == b"clk_i":
+            continue  # skip clock net
+        net_cell_index.append([
+            raw_name_to_index[token_b if token_a == b"PIN" else token_a]
+            for token_a, token_b in _CONNECT_RE.findall(net_body)
+        ])
+
+    cell_name_to_index: Dict[str, int] = {
+        name.decode("ascii"): idx for name, idx in raw_name_to_index.items()
+    }
 
     graph_data = GraphData(
         total_cell_number=total_cell_number,
@@ -137,9 +217,10 @@ def parse_def_file(def_path: Path) -> tuple[GraphData, Dict[str, int]]:
         fixed_id=fixed_id,
         fixed_pos=fixed_pos,
         movable_id=movable_id,
-        io_id=io_id,
-        io_pos=io_pos,
+        io_id=np.array(io_id, dtype=np.int64),
+        io_pos=np.array(io_pos, dtype=np.int64).reshape(-1, 2),
         net_cell_index=net_cell_index,
+        id_to_name={v: k for k, v in cell_name_to_index.items()},
     )
 
     LOGGER.info(
@@ -151,12 +232,166 @@ def parse_def_file(def_path: Path) -> tuple[GraphData, Dict[str, int]]:
     return graph_data, cell_name_to_index
 
 
+def _save_graph_cache(
+        cache_path: Path,
+        key: np.ndarray,
+        graph_data: GraphData,
+        name_map: Dict[str, int],
+) -> None:
+    """Persist parsed graph data as an ``.npz`` archive (no pickling)."""
+
+    edge_lengths = np.fromiter(
+        map(len, graph_data.net_cell_index),
+        dtype=np.int64,
+        count=len(graph_data.net_cell_index),
+    )
+    edge_cells = np.fromiter(
+        (vid for edge in graph_data.net_cell_index for vid in edge),
+        dtype=np.int64,
+        count=int(edge_lengths.sum()),
+    )
+    # Write to a temporary sibling and rename it into place, so an interrupted
+    # write never leaves a truncated archive under the cache name.
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp_path.open("wb") as fh:
+            np.savez_compressed(
+                fh,
+                key=key,
+                counts=np.array(
+                    [graph_data.total_cell_number, graph_data.total_io_number],
+                    dtype=np.int64,
+                ),
+                fixed_id=graph_data.fixed_id,
+                fixed_pos=graph_data.fixed_pos,
+                movable_id=graph_data.movable_id,
+                io_id=graph_data.io_id,
+                io_pos=graph_data.io_pos,
+                edge_lengths=edge_lengths,
+                edge_cells=edge_cells,
+                # DEF names are ASCII without whitespace: store them as one
+                # newline-joined byte buffer instead of a padded string array.
+                names=np.frombuffer(
+                    "\n".join(name_map.keys()).encode("ascii"), dtype=np.uint8
+                ),
+                name_ids=np.array(list(name_map.values()), dtype=np.int64),
+            )
+        os.replace(tmp_path, cache_path)
+    except OSError as exc:
+        LOGGER.warning("Could not write parse cache %s: %s", cache_path, exc)
+        tmp_path.unlink(missing_ok=True)
+
+
+def _load_graph_cache(
+        cache_path: Path, key: np.ndarray
+) -> Optional[tuple[GraphData, Dict[str, int]]]:
+    """Return cached graph data, or ``None`` if missing, stale or unreadable."""
+
+    if not cache_path.exists():
+        return None
+    try:
+        with np.load(cache_path, allow_pickle=False) as data:
+            if not np.array_equal(data["key"], key):
+                return None
+            total_cell_number, total_io_number = data["counts"].tolist()
+            offsets = np.concatenate(([0], np.cumsum(data["edge_lengths"]))).tolist()
+            edge_cells = data["edge_cells"].tolist()
+            names_blob = data["names"].tobytes().decode("ascii")
+            names = names_blob.split("\n") if names_blob else []
+            name_map = dict(zip(names, data["name_ids"].tolist()))
+            fixed_id = data["fixed_id"]
+            graph_data = GraphData(
+                total_cell_number=total_cell_number,
+                total_io_number=total_io_number,
+                fixed_node_num=len(fixed_id),
+                fixed_id=fixed_id,
+                fixed_pos=data["fixed_pos"],
+                movable_id=data["movable_id"],
+                io_id=data["io_id"],
+                io_pos=data["io_pos"],
+                net_cell_index=[
+                    edge_cells[start:stop]
+                    for start, stop in zip(offsets[:-1], offsets[1:])
+                ],
+                id_to_name={v: k for k, v in name_map.items()},
+            )
+    except (
+            OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile, zlib.error
+    ) as exc:
+        LOGGER.warning("Ignoring unreadable parse cache %s: %s", cache_path, exc)
+        return None
+    return graph_data, name_map
+
+
 # ---------------------------------------------------------------------------
 # Output helpers
 # ---------------------------------------------------------------------------
 
-def write_hypergraph(graph_data: GraphData, path: Path) -> None:
-    """Write the hyper‑graph summary to *hypergraph.txt*."""
+def _format_edges(edges: List[List[int]]) -> str:
+    """Format hyperedges as newline-separated lines of vertex IDs."""
+
+    return "\n".join(" ".join(map(str, edge)) for edge in edges)
+
+
+# Hyperedges visible to forked formatting workers (set in the child only).
+_worker_edges: List[List[int]] = []
+
+
+def _init_edge_worker(edges: List[List[int]]) -> None:
+    """Pool initializer: publish the inherited edge list to this worker."""
+
+    global _worker_edges
+    _worker_edges = edges
+
+
+def _format_edge_range(bounds: tuple[int, int]) -> str:
+    """Format ``_worker_edges[start:stop]`` inside a pool worker."""
+
+    start, stop = bounds
+    return _format_edges(_worker_edges[start:stop])
+
+
+def _usable_cpu_count() -> int:
+    """CPUs this process may run on (honours affinity / container limits)."""
+
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def write_hypergraph(
+        graph_data: GraphData, path: Path, parallel: bool = False
+) -> None:
+    """Write the hyper‑graph summary to *hypergraph.txt*.
+
+    *parallel* opts in to formatting large edge lists in a forked worker pool.
+    It is ignored inside daemonic processes (e.g. Pool workers), which may not
+    start children, and on platforms without the fork start method.
+    """
+
+    edges = graph_data.net_cell_index
+    n_workers = _usable_cpu_count()
+    if (
+            parallel
+            and len(edges) >= _PARALLEL_EDGE_THRESHOLD
+            and n_workers > 1
+            and "fork" in multiprocessing.get_all_start_methods()
+            and not multiprocessing.current_process().daemon
+    ):
+        # With fork, initargs are inherited by the workers rather than
+        # pickled, so the edge list is never serialised.
+        step = -(-len(edges) // n_workers)
+        bounds = [
+            (start, min(start + step, len(edges)))
+            for start in range(0, len(edges), step)
+        ]
+        ctx = multiprocessing.get_context("fork")
+        with ctx.Pool(
+                n_workers, initializer=_init_edge_worker, initargs=(edges,)
+        ) as pool:
+            chunks = pool.map(_format_edge_range, bounds, chunksize=1)
+    else:
+        chunks = [_format_edges(edges)]
 
     total_vertices = graph_data.total_cell_number + graph_data.total_io_number
     with path.open("w", encoding="ascii") as fh:
@@ -164,8 +399,9 @@ def write_hypergraph(graph_data: GraphData, path: Path) -> None:
         fh.write(f"  Number of macros + std_cells: {graph_data.total_cell_number}\n")
         fh.write(f"  Number of IOs: {graph_data.total_io_number}\n")
         fh.write("hyperedges: driver_id load_id1 load_id2 ...\n")
-        for edge in graph_data.net_cell_index:
-            fh.write(" ".join(map(str, edge)) + "\n")
+        if edges:
+            fh.write("\n".join(chunks))
+            fh.write("\n")
 
     LOGGER.info("Wrote hypergraph to %s", path)
 
@@ -175,34 +411,54 @@ def write_vertex_info(
 ) -> None:
     """Write detailed vertex information to *vertex_info.txt*."""
 
-    id_to_name = {v: k for k, v in name_map.items()}
-    fixed_set = set(graph_data.fixed_id)
-    io_set = set(graph_data.io_id)
+    id_to_name = graph_data.id_to_name
+    if id_to_name is None:
+        id_to_name = {v: k for k, v in name_map.items()}
+    total_vertices = graph_data.total_cell_number + graph_data.total_io_number
 
+    # Scatter the fixed / IO coordinates into dense per-vertex arrays; IOs are
+    # written last so they take precedence, as before.
+    # x and y are kept as separate flat arrays so each row is fed from plain
+    # ints rather than unpacked from a nested [x, y] list.
+    is_fixed_arr = np.zeros(total_vertices, dtype=np.uint8)
+    x_arr = np.zeros(total_vertices, dtype=np.int64)
+    y_arr = np.zeros(total_vertices, dtype=np.int64)
+    for ids, pos in (
+            (graph_data.fixed_id, graph_data.fixed_pos),
+            (graph_data.io_id, graph_data.io_pos),
+    ):
+        is_fixed_arr[ids] = 1
+        x_arr[ids] = pos[:, 0]
+        y_arr[ids] = pos[:, 1]
+
+    # Scatter names the same way, using a boolean mask (rather than per-vertex
+    # dict membership tests) to find the vertices that need a placeholder.
+    name_ids = np.fromiter(id_to_name.keys(), dtype=np.int64, count=len(id_to_name))
+    name_vals = np.array(list(id_to_name.values()), dtype=object)
+    in_range = name_ids < total_vertices
+    names = np.empty(total_vertices, dtype=object)
+    has_name = np.zeros(total_vertices, dtype=bool)
+    names[name_ids[in_range]] = name_vals[in_range]
+    has_name[name_ids[in_range]] = True
+    names[~has_name] = [
+        f"UNRESOLVED_{vid}" for vid in np.flatnonzero(~has_name).tolist()
+    ]
+
+    rows = [
+        f"{vid}, {vname}, {is_fixed}, {x}, {y}"
+        for vid, vname, is_fixed, x, y in zip(
+            range(total_vertices),
+            names.tolist(),
+            is_fixed_arr.tolist(),
+            x_arr.tolist(),
+            y_arr.tolist(),
+        )
+    ]
     with path.open("w", encoding="ascii") as fh:
-        # fh.write("vertex_id, type, vertex_name, is_fixed, x, y\n")
         fh.write("vertex_id, vertex_name, is_fixed, x, y\n")
-        total_vertices = graph_data.total_cell_number + graph_data.total_io_number
-        for vid in range(total_vertices):
-            vname = id_to_name.get(vid, f"UNRESOLVED_{vid}")
-
-            if vid in io_set:
-                # vtype = "IO"
-                is_fixed = 1
-                idx = graph_data.io_id.index(vid)
-                x, y = graph_data.io_pos[idx]
-            elif vid in fixed_set:
-                # vtype = "macro"
-                is_fixed = 1
-                idx = graph_data.fixed_id.index(vid)
-                x, y = graph_data.fixed_pos[idx]
-            else:
-                # vtype = "std_cell"
-                is_fixed = 0
-                x = y = 0
-
-            # fh.write(f"{vid}, {vtype}, {vname}, {is_fixed}, {x}, {y}\n")
-            fh.write(f"{vid}, {vname}, {is_fixed}, {x}, {y}\n")
+        if rows:
+            fh.write("\n".join(rows))
+            fh.write("\n")
 
     LOGGER.info("Wrote vertex info to %s", path)
 